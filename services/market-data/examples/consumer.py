@@ -4,44 +4,160 @@ Example consumer for Market Data Service
 Subscribes to order book updates via Redis pub/sub
 """
 
+import asyncio
 import redis
 import json
 import sys
 from datetime import datetime
+from itertools import islice
 
-def format_orderbook(data):
-    """Format order book for display"""
-    symbol = data.get('symbol', 'UNKNOWN')
-    timestamp = data.get('timestamp', 0)
-    dt = datetime.fromtimestamp(timestamp / 1_000_000)  # microseconds to seconds
+from redis.asyncio import Redis
 
-    print(f"\n{'='*60}")
-    print(f"Symbol: {symbol} | Time: {dt.strftime('%H:%M:%S.%f')}")
-    print(f"{'='*60}")
+import numpy as np
 
-    bids = data.get('bids', {})
-    asks = data.get('asks', {})
+try:
+    from sortedcontainers import SortedDict
+except ImportError:
+    SortedDict = None
 
-    # Get top 5 levels
-    print("\nAsks (sellers):")
-    ask_items = sorted(asks.items(), key=lambda x: float(x[0]), reverse=True)[:5]
-    for price, qty in reversed(ask_items):
-        print(f"  {float(price):>12,.2f} | {float(qty):>10,.4f}")
+try:
+    import orjson
+    loads = orjson.loads  # C-based, parses bytes directly
+except ImportError:
+    loads = json.loads
 
-    print("\n" + "-"*40)
+# Local-time offset, resolved once so per-trade formatting stays pure
+# integer arithmetic
+_UTC_OFFSET = int(datetime.now().astimezone().utcoffset().total_seconds())
+
+def _levels_to_arrays(levels):
+    """Convert a {price_str: qty_str} level dict to float arrays"""
+    n = len(levels)
+    px = np.fromiter(levels.keys(), dtype='U32', count=n).astype(np.float64)
+    qty = np.fromiter(levels.values(), dtype='U32', count=n).astype(np.float64)
+    return px, qty
+
+def _top_n_idx(px, n, lowest):
+    """Indices of the n best prices, best-first, via argpartition"""
+    if len(px) <= n:
+        idx = np.argsort(px)
+        return idx if lowest else idx[::-1]
+    if lowest:
+        part = np.argpartition(px, n)[:n]
+        return part[np.argsort(px[part])]
+    part = np.argpartition(px, len(px) - n)[-n:]
+    return part[np.argsort(px[part])[::-1]]
+
+def _render_book(symbol, timestamp, ask_levels, bid_levels):
+    """Write the order-book display in a single stdout write.
+
+    Both level lists are (price, qty) pairs, best-first.
+    """
+    dt = datetime.fromtimestamp(timestamp / 1_000_000)  # microseconds to seconds
 
-    print("\nBids (buyers):")
-    bid_items = sorted(bids.items(), key=lambda x: float(x[0]), reverse=True)[:5]
-    for price, qty in bid_items:
-        print(f"  {float(price):>12,.2f} | {float(qty):>10,.4f}")
+    # Collect the display and emit it with a single write instead of
+    # one syscall per print()
+    out = []
+    out.append(f"\n{'='*60}")
+    out.append(f"Symbol: {symbol} | Time: {dt.strftime('%H:%M:%S.%f')}")
+    out.append(f"{'='*60}")
+
+    out.append("\nAsks (sellers):")
+    for px, qty in ask_levels:
+        out.append(f"  {px:>12,.2f} | {qty:>10,.4f}")
+
+    out.append("\n" + "-"*40)
+
+    out.append("\nBids (buyers):")
+    for px, qty in bid_levels:
+        out.append(f"  {px:>12,.2f} | {qty:>10,.4f}")
 
     # Calculate spread
-    if bid_items and ask_items:
-        best_bid = float(bid_items[0][0])
-        best_ask = float(sorted(asks.items(), key=lambda x: float(x[0]))[0][0])
+    if bid_levels and ask_levels:
+        best_bid = bid_levels[0][0]
+        best_ask = ask_levels[0][0]
         spread = best_ask - best_bid
         spread_bps = (spread / best_bid) * 10000
-        print(f"\nSpread: ${spread:.2f} ({spread_bps:.2f} bps)")
+        out.append(f"\nSpread: ${spread:.2f} ({spread_bps:.2f} bps)")
+
+    sys.stdout.write("\n".join(out) + "\n")
+
+def _iter_levels(data, side):
+    """Yield (price, qty) floats for one side under either schema"""
+    if f'{side}_px' in data:
+        yield from zip(data[f'{side}_px'], data[f'{side}_qty'])
+    else:
+        for px, qty in data.get(side, {}).items():
+            yield float(px), float(qty)
+
+def format_orderbook(data):
+    """Format order book for display"""
+    if 'asks_px' in data:
+        # Sorted-array schema: parallel price/qty arrays published
+        # best-first as JSON numbers — nothing to parse or sort
+        ask_levels = list(zip(data['asks_px'][:5], data['asks_qty'][:5]))
+        bid_levels = list(zip(data['bids_px'][:5], data['bids_qty'][:5]))
+    else:
+        # Legacy {price_str: qty_str} dict schema
+        ask_px, ask_qty = _levels_to_arrays(data.get('asks', {}))
+        bid_px, bid_qty = _levels_to_arrays(data.get('bids', {}))
+        ask_levels = [(ask_px[i], ask_qty[i])
+                      for i in _top_n_idx(ask_px, 5, lowest=True)]
+        bid_levels = [(bid_px[i], bid_qty[i])
+                      for i in _top_n_idx(bid_px, 5, lowest=False)]
+
+    _render_book(data.get('symbol', 'UNKNOWN'), data.get('timestamp', 0),
+                 ask_levels, bid_levels)
+
+class OrderBookView:
+    """Incrementally maintained order-book view.
+
+    Keeps bids and asks in SortedDicts across messages, so a delta
+    message only touches the changed levels and reading the top N is
+    O(N) instead of re-sorting the whole book on every update. Requires
+    sortedcontainers; fall back to the stateless format_orderbook when
+    it is unavailable.
+    """
+
+    def __init__(self, depth=5):
+        self.depth = depth
+        self.bids = SortedDict(lambda px: -px)  # best (highest) bid first
+        self.asks = SortedDict()                # best (lowest) ask first
+        self.symbol = 'UNKNOWN'
+        self.timestamp = 0
+
+    def update(self, data):
+        """Apply a snapshot or delta message and render the book"""
+        self.symbol = data.get('symbol', self.symbol)
+        self.timestamp = data.get('timestamp', 0)
+
+        if data.get('type') == 'delta':
+            for px, qty in _iter_levels(data, 'bids'):
+                self.adjust(self.bids, px, qty)
+            for px, qty in _iter_levels(data, 'asks'):
+                self.adjust(self.asks, px, qty)
+        else:
+            # Snapshot: rebuild both sides
+            self.bids.clear()
+            self.asks.clear()
+            for px, qty in _iter_levels(data, 'bids'):
+                if qty:
+                    self.bids[px] = qty
+            for px, qty in _iter_levels(data, 'asks'):
+                if qty:
+                    self.asks[px] = qty
+
+        _render_book(self.symbol, self.timestamp,
+                     list(islice(self.asks.items(), self.depth)),
+                     list(islice(self.bids.items(), self.depth)))
+
+    @staticmethod
+    def adjust(book, px, qty):
+        """Set or delete one price level (qty 0 deletes)"""
+        if qty:
+            book[px] = qty
+        else:
+            book.pop(px, None)
 
 def format_trade(data):
     """Format trade for display"""
@@ -52,19 +168,45 @@ def format_trade(data):
     is_buyer_maker = data.get('is_buyer_maker', False)
     side = 'SELL' if is_buyer_maker else 'BUY'
 
-    dt = datetime.fromtimestamp(timestamp / 1000)  # milliseconds to seconds
+    # hh:mm:ss by seconds-of-day arithmetic; datetime.fromtimestamp plus
+    # locale-aware strftime is several times slower per trade
+    s_of_day = (int(timestamp) // 1000 + _UTC_OFFSET) % 86400
+    h, r = divmod(s_of_day, 3600)
+    m, s = divmod(r, 60)
+
+    sys.stdout.write(
+        f"[{h:02d}:{m:02d}:{s:02d}] {symbol} {side:4s} "
+        f"{quantity:>10,.4f} @ ${price:>10,.2f}\n"
+    )
+
+def _process_batch(batch, dispatch):
+    """Parse and dispatch a burst of pubsub messages"""
+    for message in batch:
+        if message['type'] != 'message':
+            continue
 
-    print(f"[{dt.strftime('%H:%M:%S')}] {symbol} {side:4s} {quantity:>10,.4f} @ ${price:>10,.2f}")
+        # One O(1) dict lookup on the exact channel name instead of
+        # substring scans per message
+        fn = dispatch.get(message['channel'])
+        if fn is not None:
+            fn(loads(message['data']))
 
-def main():
+    # One flush per burst keeps output timely when stdout is piped
+    sys.stdout.flush()
+
+async def main():
     symbol = sys.argv[1] if len(sys.argv) > 1 else 'BTCUSDT'
 
     print(f"Connecting to Redis...")
-    r = redis.Redis(host='localhost', port=6379, decode_responses=True)
+    # Leave responses as bytes: orjson parses bytes faster than str and
+    # this skips redis-py's per-message UTF-8 decode. RESP3 gives
+    # redis-py cheaper push-message framing for pubsub.
+    r = Redis(host='localhost', port=6379, decode_responses=False,
+              protocol=3)
 
     # Test connection
     try:
-        r.ping()
+        await r.ping()
         print(f"Connected to Redis successfully")
     except redis.ConnectionError:
         print("ERROR: Could not connect to Redis. Is it running?")
@@ -82,25 +224,51 @@ def main():
     print(f"  - {trade_channel}")
     print(f"\nWaiting for messages... (Ctrl+C to quit)\n")
 
-    pubsub.subscribe(orderbook_channel, trade_channel)
+    await pubsub.subscribe(orderbook_channel, trade_channel)
+
+    # Channels arrive as bytes (decode_responses=False). Maintain the
+    # book incrementally when sortedcontainers is available; otherwise
+    # render each message statelessly.
+    if SortedDict is not None:
+        handle_orderbook = OrderBookView().update
+    else:
+        handle_orderbook = format_orderbook
+    dispatch = {
+        orderbook_channel.encode(): handle_orderbook,
+        trade_channel.encode(): format_trade,
+    }
 
     try:
-        for message in pubsub.listen():
-            if message['type'] != 'message':
+        # Block for the first message, then drain whatever else is
+        # already queued so bursts are handled in one batch instead of
+        # paying a read per message. Awaiting between bursts lets the
+        # event loop overlap parsing/display with network reads.
+        while True:
+            message = await pubsub.get_message(timeout=1.0)
+            if message is None:
                 continue
 
-            channel = message['channel']
-            data = json.loads(message['data'])
+            batch = [message]
+            while True:
+                message = await pubsub.get_message(timeout=0)
+                if message is None:
+                    break
+                batch.append(message)
 
-            if 'orderbook' in channel:
-                format_orderbook(data)
-            elif 'trades' in channel:
-                format_trade(data)
+            _process_batch(batch, dispatch)
 
-    except KeyboardInterrupt:
-        print("\n\nShutting down...")
-        pubsub.unsubscribe()
-        r.close()
+    finally:
+        await pubsub.unsubscribe()
+        await r.aclose()
 
 if __name__ == '__main__':
-    main()
+    try:
+        import uvloop
+        uvloop.install()
+    except ImportError:
+        pass  # stock asyncio event loop works too, just slower
+
+    try:
+        asyncio.run(main())
+    except KeyboardInterrupt:
+        print("\n\nShutting down...")
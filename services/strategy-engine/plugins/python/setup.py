@@ -0,0 +1,33 @@
+#!/usr/bin/env python3
+"""Optional ahead-of-time build for Python plugin strategies
+
+Compiles example_strategy.py to a native extension module with mypyc.
+Unlike numba, the compiled code has no per-process JIT warmup, which
+matters because the engine starts one Python process per strategy.
+
+The numeric ring-buffer kernel in utils/_momentum.py is deliberately
+left out of the build: numba can only decorate plain Python functions,
+so it stays interpreted (and numba-jitted when numba is installed)
+while mypyc compiles the surrounding strategy code.
+
+The interpreted .py module keeps working unchanged; Python simply
+prefers the compiled .so when one is present next to it.
+
+Usage:
+    pip install 'mypy>=1.5.0'
+    python setup.py build_ext --inplace
+"""
+
+from setuptools import setup
+
+try:
+    from mypyc.build import mypycify
+except ImportError:
+    raise SystemExit(
+        "mypyc is not installed. Install it with: pip install 'mypy>=1.5.0'"
+    )
+
+setup(
+    name="b25-python-strategies",
+    ext_modules=mypycify(["example_strategy.py"]),
+)
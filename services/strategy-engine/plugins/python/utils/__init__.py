@@ -0,0 +1 @@
+"""Shared helpers for Python plugin strategies"""
@@ -0,0 +1,40 @@
+"""Numba-compiled momentum kernel
+
+Lives in its own interpreted module so the optional mypyc build of
+example_strategy (see setup.py) does not compile it: numba can only
+decorate plain Python functions, not mypyc-compiled builtins.
+"""
+
+from ._njit import njit
+
+
+@njit(cache=True)
+def _momentum_update(buf, head, count, new_price, threshold):
+    """Push a price into a symbol's ring buffer and classify momentum.
+
+    Returns (momentum, head, count, signal_code) where signal_code is
+    1 for buy, -1 for sell and 0 for no signal. Compiled with numba
+    when available; plain Python otherwise.
+    """
+    lookback = buf.shape[0]
+    buf[head] = new_price
+    head = (head + 1) % lookback
+    if count < lookback:
+        count += 1
+
+    if count >= lookback:
+        oldest = buf[head]
+    else:
+        oldest = buf[0]
+
+    momentum = 0.0
+    if count >= 2 and oldest != 0.0:
+        momentum = (new_price - oldest) / oldest
+
+    signal_code = 0
+    if momentum > threshold:
+        signal_code = 1
+    elif momentum < -threshold:
+        signal_code = -1
+
+    return momentum, head, count, signal_code
@@ -0,0 +1,18 @@
+"""Optional numba JIT support
+
+Exposes ``njit`` from numba when it is installed. When numba is not
+available, falls back to a no-op decorator so strategies keep working
+(just without the compiled fast path).
+"""
+
+try:
+    from numba import njit  # noqa: F401
+except ImportError:
+    def njit(*args, **kwargs):  # type: ignore[no-redef]
+        """No-op stand-in for numba.njit"""
+        if args and callable(args[0]):
+            return args[0]
+
+        def wrap(func):
+            return func
+        return wrap